@@ -0,0 +1,89 @@
+# MIT License
+#
+# Copyright (c) 2024 Tomas Vecera, tomas@vecera.dev
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#  *
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#  *
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Optional compiled fast path for the Intel HEX record helpers
+
+Drop-in replacements for calculate_checksum() and bytes_to_hex_record()
+from eeprom_programmer.py, which falls back to the pure Python versions
+when this module is not built. Build in place with:
+
+    python setup_hex_fast.py build_ext --inplace
+"""
+
+cdef const char *_HEX_CHARS = "0123456789ABCDEF"
+
+
+cdef inline Py_ssize_t _put_hex(char *buf, Py_ssize_t pos, unsigned int value):
+    buf[pos] = _HEX_CHARS[(value >> 4) & 0xF]
+    buf[pos + 1] = _HEX_CHARS[value & 0xF]
+    return pos + 2
+
+
+cpdef int calculate_checksum(const unsigned char[::1] data):
+    """Calculate Intel HEX checksum for a byte buffer"""
+    cdef unsigned int total = 0
+    cdef Py_ssize_t i
+
+    for i in range(data.shape[0]):
+        total += data[i]
+
+    # Two's complement of the byte sum
+    return (256 - (total & 0xFF)) & 0xFF
+
+
+cpdef bytes bytes_to_hex_record(unsigned int address, unsigned int record_type,
+                                const unsigned char[::1] line):
+    """Convert bytes to an Intel HEX record (ASCII bytes)
+
+    Emits the whole record - header, hex-encoded data and checksum - in
+    a single pass over a stack buffer.
+    """
+    cdef Py_ssize_t byte_count = line.shape[0]
+    # ':' + count + address + type + 255 data bytes + checksum
+    cdef char buf[1 + 2 + 4 + 2 + 510 + 2]
+    cdef Py_ssize_t pos = 0
+    cdef unsigned int total
+    cdef unsigned char b
+    cdef Py_ssize_t i
+
+    if address > 0xFFFF:
+        raise ValueError(f"Address {address:X} exceeds 0xFFFF")
+    if record_type > 0xFF:
+        raise ValueError(f"Record type {record_type:X} exceeds 0xFF")
+    if byte_count > 255:
+        raise ValueError("Data exceeds 255 bytes per record")
+
+    buf[pos] = b':'
+    pos += 1
+    pos = _put_hex(buf, pos, <unsigned int> byte_count)
+    pos = _put_hex(buf, pos, address >> 8)
+    pos = _put_hex(buf, pos, address & 0xFF)
+    pos = _put_hex(buf, pos, record_type)
+
+    total = (<unsigned int> byte_count) + (address >> 8) + (address & 0xFF) + record_type
+    for i in range(byte_count):
+        b = line[i]
+        total += b
+        pos = _put_hex(buf, pos, b)
+
+    pos = _put_hex(buf, pos, (256 - (total & 0xFF)) & 0xFF)
+    return buf[:pos]
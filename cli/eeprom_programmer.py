@@ -20,12 +20,32 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 
+import os
+import re
+from binascii import hexlify
 import serial
 import serial.tools.list_ports
 import time
-from typing import List, Tuple, Dict
+from functools import lru_cache
+from typing import Iterator, List, Tuple, Dict
 import sys
 
+# Common Arduino manufacturers/identifiers
+_VENDOR_TAGS = ('arduino', 'wch.cn', 'ftdi')
+
+# One dump row as printed by the firmware: "AAAA: HH HH ... HH "
+_DUMP_ROW_RE = re.compile(rb'(?m)^([0-9A-Fa-f]{4}): ((?:[0-9A-Fa-f]{2} )+)\r?$')
+
+
+@lru_cache(maxsize=1)
+def _comports() -> tuple:
+    """Enumerate serial ports once per process
+
+    USB enumeration is comparatively slow; --list and port auto-detection
+    both need the same snapshot within a single CLI run.
+    """
+    return tuple(serial.tools.list_ports.comports())
+
 
 def find_arduino_ports() -> List[Dict[str, str]]:
     """Find all Arduino devices connected to the system
@@ -39,10 +59,9 @@ def find_arduino_ports() -> List[Dict[str, str]]:
     """
     arduino_ports = []
 
-    for serial_port in serial.tools.list_ports.comports():
-        # Common Arduino manufacturers/identifiers
-        if any(id in serial_port.manufacturer.lower() if serial_port.manufacturer else False
-               for id in ['arduino', 'wch.cn', 'ftdi']):
+    for serial_port in _comports():
+        mfg = (serial_port.manufacturer or '').lower()
+        if any(tag in mfg for tag in _VENDOR_TAGS):
             arduino_ports.append({
                 'port': serial_port.device,
                 'desc': serial_port.description,
@@ -53,22 +72,21 @@ def find_arduino_ports() -> List[Dict[str, str]]:
     return arduino_ports
 
 
-def calculate_checksum(line: List[int]) -> int:
-    """Calculate Intel HEX checksum for a list of bytes
+def calculate_checksum(data: bytes) -> int:
+    """Calculate Intel HEX checksum for a byte buffer
 
     Args:
-        line: List of integers (0-255) to checksum
+        data: Bytes (or any iterable of integers 0-255) to checksum
 
     Returns:
         Checksum byte (0-255)
     """
-    # Sum all bytes
-    total = sum(line) & 0xFF
-    # Two's complement
-    return ((~total) + 1) & 0xFF
+    # Two's complement of the byte sum - sum() over a bytes object runs
+    # the whole reduction in C
+    return (-sum(data)) & 0xFF
 
 
-def bytes_to_hex_record(address: int, record_type: int, line: List[int]) -> str:
+def bytes_to_hex_record(address: int, record_type: int, line: bytes) -> bytes:
     """Convert bytes to Intel HEX record string
 
     Intel HEX record format:
@@ -90,10 +108,11 @@ def bytes_to_hex_record(address: int, record_type: int, line: List[int]) -> str:
     Args:
         address: Starting address for this record (0-65535)
         record_type: Record type (0-255)
-        line: List of bytes (0-255) for this record
+        line: Data bytes for this record
 
     Returns:
-        Intel HEX record string including checksum
+        Intel HEX record as ASCII bytes including checksum, ready to be
+        written without re-encoding
 
     Raises:
         ValueError: If address > 0xFFFF or any data byte > 0xFF
@@ -110,20 +129,58 @@ def bytes_to_hex_record(address: int, record_type: int, line: List[int]) -> str:
     addr_hi = (address >> 8) & 0xFF
     addr_lo = address & 0xFF
 
-    # Build list of all bytes that contribute to checksum
-    checksum_data = [
-                        byte_count,  # Length
-                        addr_hi,  # Address high byte
-                        addr_lo,  # Address low byte
-                        record_type  # Record type
-                    ] + line  # Data bytes
+    # Checksum covers the header fields plus the data bytes - summing them
+    # directly avoids allocating a throwaway list per record
+    checksum = (-(byte_count + addr_hi + addr_lo + record_type + sum(line))) & 0xFF
+
+    # Assemble the record in a single bytearray - hexlify() encodes the
+    # data field in C and nothing needs re-encoding at write time
+    buf = bytearray(b':')
+    buf += f'{byte_count:02X}{addr_hi:02X}{addr_lo:02X}{record_type:02X}'.encode('ascii')
+    buf += hexlify(bytes(line)).upper()
+    buf += f'{checksum:02X}'.encode('ascii')
+    return bytes(buf)
+
 
-    # Calculate checksum
-    checksum = calculate_checksum(checksum_data)
+def bytes_to_hex_records(base_addr: int, data: bytes) -> bytes:
+    """Convert a data buffer to newline-joined Intel HEX data records
 
-    # Format record string
-    hex_data = ''.join(f'{b:02X}' for b in line)
-    return f":{byte_count:02X}{addr_hi:02X}{addr_lo:02X}{record_type:02X}{hex_data}{checksum:02X}"
+    Slices the buffer in 16-byte strides and emits one data record per
+    slice, joined into a single bytes object for bulk export. Records are built
+    inline from memoryview slices with the checksum folded into the loop,
+    skipping the per-record validation and call overhead of
+    bytes_to_hex_record.
+
+    Args:
+        base_addr: Address of the first byte in the buffer
+        data: Data bytes to convert
+
+    Returns:
+        Newline-joined Intel HEX data records (without end-of-file record)
+    """
+    records = []
+    append = records.append
+    view = memoryview(data)
+
+    for chunk_start in range(0, len(data), 16):
+        chunk = view[chunk_start:chunk_start + 16]
+        address = (base_addr + chunk_start) & 0xFFFF
+        byte_count = len(chunk)
+        checksum = (-(byte_count + (address >> 8) + (address & 0xFF) + sum(chunk))) & 0xFF
+        append(f':{byte_count:02X}{address:04X}00'.encode('ascii')
+               + hexlify(chunk).upper()
+               + f'{checksum:02X}'.encode('ascii'))
+
+    return b'\n'.join(records)
+
+
+try:
+    # Optional compiled fast path for environments where the export runs
+    # against very large images - build it in place with:
+    #   python setup_hex_fast.py build_ext --inplace
+    from _hex_fast import calculate_checksum, bytes_to_hex_record
+except ImportError:
+    pass
 
 
 class EEPROMProgrammerError(Exception):
@@ -141,7 +198,51 @@ class ArduinoClient:
             timeout: Serial timeout in seconds (default: 1.0)
         """
         self.ser = serial.Serial(port, baudrate, timeout=timeout)
-        time.sleep(2)  # Wait for Arduino reset
+
+        # Opportunistic transport tuning, best effort on every platform:
+        # larger OS buffers (Windows-only API) and a 1 ms FTDI latency
+        # timer on Linux - the 16 ms default dominates the round-trip time
+        # of small request/response exchanges
+        try:
+            self.ser.set_buffer_size(rx_size=65536, tx_size=65536)
+        except (AttributeError, ValueError):
+            pass  # POSIX builds of pyserial have no set_buffer_size
+
+        try:
+            device = os.path.basename(os.path.realpath(port))
+            latency_timer = f'/sys/bus/usb-serial/devices/{device}/latency_timer'
+            if os.path.exists(latency_timer):
+                with open(latency_timer, 'w') as f:
+                    f.write('1')
+        except OSError:
+            pass  # needs a udev rule or root; the default still works
+
+        # Toggle DTR so the board resets deterministically, then wait for
+        # the boot menu instead of sleeping a fixed 2 seconds - most boards
+        # are ready well before that
+        self.ser.dtr = False
+        time.sleep(0.05)
+        self.ser.dtr = True
+
+        self.ser.timeout = 0.2
+        deadline = time.time() + 3
+        banner = b''
+        while time.time() < deadline:
+            banner += self.ser.read_until(b"Commands:", size=4096)
+            if banner.endswith(b"Commands:"):
+                # Consume the rest of the menu up to the prompt
+                self.ser.read_until(b'>', size=4096)
+                break
+        else:
+            # No banner observed (e.g. auto-reset disabled) - fall back to
+            # the conservative fixed wait
+            time.sleep(2)
+
+        # The banner reports the configured chip's memory size; remember it
+        # so dumps can preallocate their buffers exactly
+        size_match = re.search(rb'Memory size:\s+(\d+)', banner)
+        self.eeprom_size = int(size_match.group(1)) if size_match else None
+
         self._clear_buffer()
 
     def _clear_buffer(self):
@@ -149,48 +250,51 @@ class ArduinoClient:
         self.ser.reset_input_buffer()
         self.ser.reset_output_buffer()
 
-    def _send_command(self, cmd: str) -> str:
-        """Send a command and return the response
-
-        Args:
-            cmd: Single character command
+    def _drain_input(self):
+        """Discard residual input without resetting the OS buffers
 
-        Returns:
-            Response string from the programmer
+        Reading exactly what is already waiting returns immediately and is
+        much cheaper than reset_input_buffer(), which is an ioctl (or a USB
+        control transfer on some platforms).
         """
-        self._clear_buffer()
-        self.ser.write(cmd.encode())
-        time.sleep(0.1)
-
-        response = []
-        timeout = time.time() + 5  # 5 second timeout
-
-        while True:
-            if self.ser.in_waiting:
-                line = self.ser.readline().decode().strip()
-                if line:  # Only append non-empty lines
-                    response.append(line)
-                    break
+        if self.ser.in_waiting:
+            self.ser.read(self.ser.in_waiting)
 
-            # Check for timeout
-            if time.time() > timeout:
-                raise EEPROMProgrammerError("Timeout waiting for Arduino response")
+    def _send_command(self, cmd: str) -> None:
+        """Send a command without waiting for a response line
 
-            time.sleep(0.1)
+        Every caller immediately synchronizes on a prompt or sentinel of
+        its own, so a readline round trip here would just be a second wait
+        for the same output.
 
-        return '\n'.join(response)
+        Args:
+            cmd: Single character command
+        """
+        self.ser.write(cmd.encode())
 
     def _send_hex_value(self, value: int, digits: int = 4) -> None:
         """Send a hex value when prompted
 
+        Waits for the firmware's ": " prompt before sending. get_hex_value
+        clears its input 10 ms *after* the prompt is printed (delay(10)
+        first, then the flush), so on a low-latency link a reply sent the
+        moment the prompt appears would land inside the flush window and be
+        lost - hence the short sleep before writing. No fixed sleep is
+        needed afterwards; the next sentinel read resynchronizes.
+
         Args:
             value: Integer value to send
             digits: Number of hex digits (default: 4)
         """
+        self.ser.timeout = 5.0
+        prompt = self.ser.read_until(b': ', size=256)
+        if not prompt.endswith(b': '):
+            raise EEPROMProgrammerError("Timeout waiting for value prompt")
+        time.sleep(0.02)  # outlast the firmware's post-prompt input flush
         hex_str = f"{value:0{digits}X}"
         self.ser.write(hex_str.encode())
         self.ser.write(b'\r\n')
-        time.sleep(0.1)
+        self.ser.flush()
 
     def erase(self, start_addr: int = 0, end_addr: int = 0, pattern: int = 0xFF):
         """Erase EEPROM section with specified pattern
@@ -200,7 +304,9 @@ class ArduinoClient:
             end_addr: End address (default: 0 = full size)
             pattern: Byte pattern to write (default: 0xFF)
         """
-        # Send initial command
+        # Send initial command - the hex-value prompts that follow do the
+        # synchronization, so there is no response line to wait for here
+        self._drain_input()
         self._send_command('E')
 
         # Send parameters
@@ -208,67 +314,72 @@ class ArduinoClient:
         self._send_hex_value(end_addr)
         self._send_hex_value(pattern, digits=2)
 
-        # Wait for completion response
-        timeout = time.time() + 30  # 30 second timeout for erase
-
-        while True:
-            if self.ser.in_waiting:
-                line = self.ser.readline().decode().strip()
-                if line.endswith("Commands:"):
-                    break
-                if line:
-                    print(line)
+        # Wait for completion - read_until() matches the sentinel inside
+        # pyserial instead of decoding and checking every line in Python
+        self.ser.timeout = 30.0  # 30 second timeout for erase
+        chunk = self.ser.read_until(b"Commands:", size=65536)
+        if not chunk.endswith(b"Commands:"):
+            raise EEPROMProgrammerError("Timeout waiting for erase completion")
 
-            # Check for timeout
-            if time.time() > timeout:
-                raise EEPROMProgrammerError("Timeout waiting for erase completion")
+        for line in chunk.decode().splitlines():
+            line = line.strip()
+            if line and not line.endswith("Commands:"):
+                print(line)
 
-            time.sleep(0.1)
+    def iter_read(self, start_addr: int = 0) -> Iterator[Tuple[int, bytes]]:
+        """Dump EEPROM contents row by row
 
-    def read(self, start_addr: int = 0) -> List[Tuple[int, List[int]]]:
-        """Dump EEPROM contents
+        Yields each row as soon as its line arrives, so callers can stream
+        the dump to disk instead of holding all of it in memory.
 
         Args:
             start_addr: Start address for dump (default: 0)
 
-        Returns:
-            List of tuples containing (address, [bytes])
+        Yields:
+            Tuples containing (address, bytes)
         """
+        self._drain_input()
         self._send_command('D')
         self._send_hex_value(start_addr)
 
-        dump_data = []
-        current_addr = None
-        current_bytes = []
-
+        # Read the dump in sentinel-framed chunks - read_until() does the
+        # match inside pyserial. The firmware pauses every 10 lines with a
+        # "Press SPACE" prompt, which we answer and keep reading.
+        self.ser.timeout = 1.0
+        buffer = b''
         while True:
-            if self.ser.in_waiting:
-                line = self.ser.readline().decode().strip()
-
-                if line.endswith('>'):
-                    if current_addr is not None and current_bytes:
-                        dump_data.append((current_addr, current_bytes))
-                    break
-
-                if not line or line.startswith('Addr'):
-                    continue
-
-                if line.startswith('Press'):  # Continue dump after page break
-                    self.ser.write(b' ')
-                    time.sleep(0.1)
-                elif ': ' in line:
-                    print(line)
-                    if current_addr is not None and current_bytes:
-                        dump_data.append((current_addr, current_bytes))
-                    addr_str, data_str = line.split(': ')
-                    current_addr = int(addr_str, 16)
-                    current_bytes = []
+            chunk = self.ser.read_until(b'>', size=1 << 20)
+            buffer += chunk
+
+            # Scan all complete lines received so far with one precompiled
+            # regex pass - row lines match, prompts and menu lines do not
+            cut = buffer.rfind(b'\n') + 1
+            if cut:
+                for match in _DUMP_ROW_RE.finditer(buffer, 0, cut):
+                    print(match.group(0).decode().strip())
+                    # bytes.fromhex() parses the whole row in C instead of
+                    # one int(..., 16) call per byte
+                    yield (int(match.group(1), 16),
+                           bytes.fromhex(match.group(2).replace(b' ', b'').decode()))
+                buffer = buffer[cut:]
+
+            if chunk.endswith(b'>'):
+                break
+            if b'Press' in buffer:  # Continue dump after page break
+                self.ser.write(b' ')
+                continue
+            raise EEPROMProgrammerError("Timeout waiting for dump data")
+
+    def read(self, start_addr: int = 0) -> List[Tuple[int, bytes]]:
+        """Dump EEPROM contents
 
-                    for byte_str in data_str.split():
-                        if byte_str:
-                            current_bytes.append(int(byte_str, 16))
+        Args:
+            start_addr: Start address for dump (default: 0)
 
-        return dump_data
+        Returns:
+            List of tuples containing (address, bytes)
+        """
+        return list(self.iter_read(start_addr))
 
     def write_hex(self, hex_data: str):
         """Write Intel HEX format data
@@ -279,23 +390,74 @@ class ArduinoClient:
         Returns:
             Status message
         """
+        self._drain_input()
         self._send_command('W')
-        time.sleep(0.2)
 
+        # The firmware flushes its input right before this prompt - records
+        # sent earlier would be lost, so sync on the prompt instead of a
+        # fixed sleep
+        self.ser.timeout = 5.0
+        prompt = self.ser.read_until(b'(finish with empty line):', size=4096)
+        if not prompt.endswith(b'(finish with empty line):'):
+            raise EEPROMProgrammerError("Timeout waiting for upload prompt")
+        # The prompt is printed with println - consume its line ending so
+        # the first acknowledgement read does not see a blank line
+        self.ser.readline()
+
+        # Send one record at a time, paced on the firmware's per-record
+        # status line. The link has no flow control and the firmware writes
+        # every byte through the MCP23017 with a verify read-back - far
+        # slower than the UART - so its 64-byte RX buffer overflows after
+        # roughly two unacknowledged records. The status line is printed
+        # before the record's EEPROM writes start, which keeps exactly one
+        # record in flight while the previous one is being programmed.
+        self.ser.timeout = 5.0
+        done = False
+        sent_eof = False
         for line in hex_data.strip().split('\n'):
-            self.ser.write(line.strip().encode() + b'\r\n')
-            time.sleep(0.1)
+            record = line.strip()
+            if not record:
+                continue
+
+            self.ser.write(record.encode() + b'\r\n')
+            if len(record) >= 9 and record[7:9] == '01':
+                sent_eof = True
+
+            # Wait for this record's acknowledgement, printing anything the
+            # firmware reports about earlier records along the way
             while True:
-                if self.ser.in_waiting:
-                    line = self.ser.readline().decode().strip()
-                    if line.startswith('Commands'):
-                        break
-                    print(line)
-                else:
+                raw = self.ser.readline()
+                if raw == b'':  # only an empty read is a timeout
+                    raise EEPROMProgrammerError("Timeout waiting for record acknowledgement")
+                response = raw.decode().strip()
+                if not response:  # blank line, keep waiting
+                    continue
+                print(response)
+                if response.startswith(('Line - Type', 'Error processing')):
                     break
-
-        # Send empty line to finish
-        self.ser.write(b'\r\n')
+                if response.startswith('Hex input complete'):
+                    done = True
+                    break
+            # The end-of-file record terminates hex_write() on the firmware
+            # side; anything sent after it would be read as menu commands
+            if done or sent_eof:
+                break
+
+        # A trailing empty line finishes the upload when the file had no
+        # end-of-file record
+        if not done and not sent_eof:
+            self.ser.write(b'\r\n')
+
+        # Read the remaining output up to the returning command menu
+        self.ser.timeout = 30.0
+        tail = self.ser.read_until(b"Commands:", size=1 << 20)
+        if not tail.endswith(b"Commands:"):
+            raise EEPROMProgrammerError("Timeout waiting for upload completion")
+
+        for line in tail.decode().splitlines():
+            line = line.strip()
+            if line and not line.endswith("Commands:"):
+                print(line)
 
     def close(self):
         """Close serial connection"""
@@ -374,34 +536,43 @@ if __name__ == "__main__":
         if args.read:
             print("\nRead EEPROM data...")
             try:
-                data = programmer.read()
-                # Save to file if output path specified
+                # Rows are converted as they arrive off the wire; the disk
+                # write happens once at the end so the file sees a single
+                # large write instead of one small write per record
                 if args.output:
                     try:
                         if args.format == 'bin':
-                            # Save as binary file
-                            with open(args.output, 'wb') as f:
-                                for _, bytes_data in data:
-                                    f.write(bytes(bytes_data))
+                            # Save as binary file - preallocate with the
+                            # size the firmware reported at connect, place
+                            # rows at their addresses and write the image
+                            # with a single call
+                            image = bytearray(programmer.eeprom_size or 0)
+                            end = 0
+                            for addr, bytes_data in programmer.iter_read():
+                                row_end = addr + len(bytes_data)
+                                if row_end > len(image):
+                                    image.extend(bytes(row_end - len(image)))
+                                image[addr:row_end] = bytes_data
+                                end = max(end, row_end)
+                            with open(args.output, 'wb', buffering=1 << 20) as f:
+                                f.write(memoryview(image)[:end])
                             print(f"\nSaved binary data to {args.output}")
 
                         else:  # hex format
                             # Save as Intel HEX file
-                            with open(args.output, 'w') as f:
-                                for addr, bytes_data in data:
-                                    # Write data in 16-byte chunks
-                                    for chunk_start in range(0, len(bytes_data), 16):
-                                        chunk = bytes_data[chunk_start:chunk_start + 16]
-                                        record = bytes_to_hex_record(addr + chunk_start, 0, chunk)
-                                        f.write(record + '\n')
-
-                                # Write end-of-file record
-                                f.write(':00000001FF\n')
+                            records = [bytes_to_hex_record(addr, 0, bytes_data)
+                                       for addr, bytes_data in programmer.iter_read()]
+                            # End-of-file record
+                            records.append(b':00000001FF')
+                            with open(args.output, 'wb') as f:
+                                f.write(b'\n'.join(records) + b'\n')
                             print(f"\nSaved Intel HEX data to {args.output}")
 
                     except Exception as e:
                         print(f"Error saving file: {str(e)}")
                         sys.exit(1)
+                else:
+                    programmer.read()
 
             except Exception as e:
                 print(f"Error reading EEPROM: {str(e)}")
@@ -0,0 +1,23 @@
+# MIT License
+#
+# Copyright (c) 2024 Tomas Vecera, tomas@vecera.dev
+#
+# Build script for the optional _hex_fast extension:
+#
+#     pip install cython
+#     python setup_hex_fast.py build_ext --inplace
+
+from setuptools import setup
+from Cython.Build import cythonize
+
+setup(
+    name='hex-fast',
+    ext_modules=cythonize(
+        '_hex_fast.pyx',
+        compiler_directives={
+            'language_level': '3',
+            'boundscheck': False,
+            'wraparound': False,
+        },
+    ),
+)